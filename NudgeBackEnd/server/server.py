@@ -1,8 +1,11 @@
+import logging
 import socket
 import sys
 
 commandport = 20
 
+log = logging.getLogger(__name__)
+
 def startSocket():
     s = socket.socket()
     host = socket.gethostname()
@@ -13,17 +16,20 @@ def startSocket():
 def getData(s,):
     connection, client_address = s.accept()
     try:
-        print >> sys.stderr, 'connection from', client_address
+        # Echo replies are tiny; don't let Nagle hold them back
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        log.info('connection from %s', client_address)
 
         # Receive the data in small chunks and retransmit it
+        # Per-chunk messages are debug only so the echo loop isn't held up by stderr
         while True:
             data = connection.recv(4096)
-            print >> sys.stderr, 'received "%s"' % data
+            log.debug('received "%s"', data)
             if data:
-                print >> sys.stderr, 'sending data back to the client'
+                log.debug('sending data back to the client')
                 connection.sendall(data)
             else:
-                print >> sys.stderr, 'no more data from', client_address
+                log.info('no more data from %s', client_address)
                 break
 
     finally:
@@ -32,9 +38,9 @@ def getData(s,):
 
 
 if __name__ == '__main__':
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
     s = startSocket()
     while True:
         # Wait for a connection
-        print >> sys.stderr, 'waiting for a connection'
+        log.info('waiting for a connection')
         getData(s)
-
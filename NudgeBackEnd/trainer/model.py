@@ -1,6 +1,7 @@
+import os
+
 import tensorflow as tf
 import numpy as np
-import pandas as pd
 
 def trainNeuralNet(train = True):
     # Data sets
@@ -8,37 +9,72 @@ def trainNeuralNet(train = True):
     TRAINING = "../data/train.csv"
     TEST = "../data/test.csv"
 
-    #Creating dataset
-    dset = pd.read_csv(TF_DATA_FILE,sep=",",usecols=('foreground_app','keyboard_activity','mouse_activity','time_last_request','productive'))
-    print ("datasize",dset.size)
-    dset.replace('', np.nan, inplace = True)
-    dset.dropna(inplace=True)
-    dset.to_csv(TRAINING,sep=',',index=False,header=False)
+    #Creating dataset, only when the harvested data is newer than the last one written
+    if not os.path.exists(TRAINING) or os.path.getmtime(TRAINING) < os.path.getmtime(TF_DATA_FILE):
+        with open(TF_DATA_FILE) as f:
+            header = f.readline().strip().split(',')
+        columns = ('foreground_app','keyboard_activity','mouse_activity','time_last_request','productive')
+        dset = np.atleast_2d(np.genfromtxt(TF_DATA_FILE,delimiter=",",skip_header=1,
+                                           usecols=[header.index(c) for c in columns]))
+        print ("datasize",dset.size)
+        # Empty fields parse as nan, drop those rows
+        dset = dset[~np.isnan(dset).any(axis=1)]
+        # Write beside the target and swap in, so a crash never leaves a torn training set
+        np.savetxt(TRAINING + ".tmp",dset,delimiter=',',fmt='%d')
+        os.replace(TRAINING + ".tmp", TRAINING)
+        # Rows are already in memory, cast them once instead of re-parsing train.csv
+        training_set = tf.contrib.learn.datasets.base.Dataset(data=dset[:, :-1].astype(np.float32),
+                                                              target=dset[:, -1].astype(np.int))
+    else:
+        training_set = tf.contrib.learn.datasets.base.load_csv_without_header (filename=TRAINING,
+                                                               target_dtype=np.int, features_dtype=np.float32)
 
-    # Load datasets.
-    training_set = tf.contrib.learn.datasets.base.load_csv_without_header (filename=TRAINING,
-                                                           target_dtype=np.int, features_dtype=np.float32)
+    # Load test dataset.
     test_set = tf.contrib.learn.datasets.base.load_csv_without_header(filename=TEST,
                                                        target_dtype=np.int, features_dtype=np.float32)
 
     #feature columns
     feature_columns = [tf.contrib.layers.real_valued_column("", dimension=4)]
 
+    # Evaluate/predict only: the net is too small to gain from thread pools or a GPU
+    config = None
+    if not train:
+        config = tf.contrib.learn.RunConfig(
+            session_config=tf.ConfigProto(intra_op_parallelism_threads=1,
+                                          inter_op_parallelism_threads=1,
+                                          device_count={'GPU': 0}))
+
     # Build 3 layer DNN with 10, 20, 10 units respectively.
     classifier = tf.contrib.learn.DNNClassifier(hidden_units=[10, 10],
                                                 n_classes=2,
-                                                model_dir="../data/model",feature_columns=feature_columns)
+                                                model_dir="../data/model",feature_columns=feature_columns,
+                                                weight_column_name="weight",
+                                                config=config)
     if(train):
         print('Training Neural Network....')
+        # Harvested data is mostly unproductive: weight rows by inverse class frequency
+        # so the loss isn't spent relearning the majority class. With a lone minority row,
+        # mini-batches would make the weighted gradient very noisy; full batch avoids that
+        class_counts = np.bincount(training_set.target, minlength=2)
+        class_weight = len(training_set.target) / (2.0 * np.maximum(class_counts, 1))
+        # Full batch, as before, held as graph constants: every step reuses the same
+        # tensors with no python-side slicing or feed_dict
+        row_weight = class_weight[training_set.target].astype(np.float32)
+        train_input_fn = lambda: ({"": tf.constant(training_set.data),
+                                   "weight": tf.constant(row_weight)},
+                                  tf.constant(training_set.target))
         # Fit model.
-        classifier.fit(x=training_set.data,
-                       y=training_set.target,
+        classifier.fit(input_fn=train_input_fn,
                        steps=1000)
         print('Training completed!')
 
-    # Evaluate accuracy.
-    accuracy_score = classifier.evaluate(x=test_set.data,
-                                         y=test_set.target)["accuracy"]
+    # Evaluate accuracy, unweighted.
+    eval_input_fn = tf.contrib.learn.io.numpy_input_fn(x={"": test_set.data,
+                                                          "weight": np.ones(len(test_set.data), dtype=np.float32)},
+                                                       y=test_set.target,
+                                                       num_epochs=1,
+                                                       shuffle=False)
+    accuracy_score = classifier.evaluate(input_fn=eval_input_fn)["accuracy"]
     print('Accuracy: {0:f}'.format(accuracy_score))
 
 